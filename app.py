@@ -1,7 +1,10 @@
-from flask import Flask, redirect, url_for, request, jsonify, send_from_directory, session
+from flask import Flask, redirect, url_for, request, jsonify, send_from_directory, session, g, has_request_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import text
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
+from sqlalchemy import text, event
+from sqlalchemy.exc import OperationalError, InterfaceError
+from sqlalchemy.sql.dml import UpdateBase
 from flask_jwt_extended import JWTManager, create_access_token, get_jwt_identity, jwt_required
 import os
 from dotenv import load_dotenv
@@ -10,6 +13,8 @@ from google.oauth2 import id_token
 from google.auth.transport import requests
 import pathlib
 import json
+import time
+from functools import wraps
 from datetime import timedelta
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -23,14 +28,33 @@ if os.getenv('FLASK_ENV') != 'production':
 app = Flask(__name__, static_folder='frontend/build/static', static_url_path='/static')
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'demo-secret-key')
 
+def _normalize_database_url(url):
+    # Heroku historically provides postgres://, SQLAlchemy expects postgresql://
+    if url.startswith('postgres://'):
+        return url.replace('postgres://', 'postgresql://', 1)
+    return url
+
 # Database configuration: prefer DATABASE_URL (Heroku Postgres), fallback to SQLite
-database_url = os.getenv('DATABASE_URL', 'sqlite:////tmp/profiles.db')
-# Heroku historically provides postgres://, SQLAlchemy expects postgresql://
-if database_url.startswith('postgres://'):
-    database_url = database_url.replace('postgres://', 'postgresql://', 1)
+database_url = _normalize_database_url(os.getenv('DATABASE_URL', 'sqlite:////tmp/profiles.db'))
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Optional read replica: GET requests read from it, everything else uses the primary
+REPLICA_BIND_KEY = 'replica'
+# After a write, keep this client on the primary long enough for replication to catch up
+REPLICA_STICKY_SECONDS = int(os.getenv('DATABASE_REPLICA_STICKY_SECONDS', '10'))
+# How long a replica health check result is trusted before probing again
+REPLICA_HEALTH_TTL_SECONDS = int(os.getenv('DATABASE_REPLICA_HEALTH_TTL_SECONDS', '30'))
+replica_url = os.getenv('DATABASE_REPLICA_URL')
+if replica_url:
+    replica_url = _normalize_database_url(replica_url)
+    replica_options = {'url': replica_url, 'pool_pre_ping': True}
+    if replica_url.startswith('postgresql'):
+        # Fail fast on an unresponsive replica host instead of waiting out the OS TCP timeout,
+        # which is longer than gunicorn's worker timeout
+        replica_options['connect_args'] = {'connect_timeout': 2}
+    app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND_KEY: replica_options}
+
 # JWT Configuration
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-jwt-secret-key')
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
@@ -118,7 +142,101 @@ def _build_redirect_uri():
     host = request.host
     return f"{scheme}://{host}/login/authorized"
 
-db = SQLAlchemy(app)
+_replica_health = {'healthy': True, 'checked_at': None}
+
+def _replica_configured():
+    return REPLICA_BIND_KEY in app.config.get('SQLALCHEMY_BINDS', {})
+
+def _mark_replica_unhealthy(error):
+    print(f"Read replica unavailable, falling back to primary: {error}")
+    _replica_health['healthy'] = False
+    _replica_health['checked_at'] = time.monotonic()
+
+def _replica_is_healthy(engine):
+    now = time.monotonic()
+    checked_at = _replica_health['checked_at']
+    if checked_at is not None and now - checked_at < REPLICA_HEALTH_TTL_SECONDS:
+        return _replica_health['healthy']
+    try:
+        # Query a real table so an empty or half-restored replica counts as down
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1 FROM profile LIMIT 1'))
+    except Exception as e:
+        # _on_replica_error already records connection/operational failures; only record anything it skipped
+        if _replica_health['checked_at'] == checked_at:
+            _mark_replica_unhealthy(e)
+        return False
+    _replica_health['healthy'] = True
+    _replica_health['checked_at'] = now
+    return True
+
+def _on_replica_error(context):
+    # Any failed replica query marks it down, so later reads skip it until the next probe
+    if context.is_disconnect or isinstance(context.sqlalchemy_exception, (OperationalError, InterfaceError)):
+        _mark_replica_unhealthy(context.original_exception)
+
+def _pin_to_primary():
+    # Read-your-writes: the rest of this request and the client's next few requests use the primary
+    if not _replica_configured() or not has_request_context():
+        return
+    g.db_use_primary = True
+    session['db_primary_until'] = time.time() + REPLICA_STICKY_SECONDS
+
+def use_primary_db(f):
+    """Force all queries in a read-only (GET) endpoint to go to the primary."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        g.db_use_primary = True
+        return f(*args, **kwargs)
+    return decorated
+
+class RoutingSession(FlaskSQLAlchemySession):
+    """Session that sends reads from GET requests to the read replica when one is configured."""
+
+    _read_from_replica = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._should_use_replica(clause):
+            self._read_from_replica = True
+            return self._db.engines[REPLICA_BIND_KEY]
+        # Bulk INSERT/UPDATE/DELETE statements skip after_flush, so pin here for read-your-writes
+        if isinstance(clause, UpdateBase):
+            _pin_to_primary()
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        self._read_from_replica = False
+        try:
+            return super().execute(*args, **kwargs)
+        except (OperationalError, InterfaceError):
+            if not self._read_from_replica:
+                raise
+            # The replica failed mid-read; _on_replica_error has marked it down, so retry on the primary.
+            # Reads only reach the replica before any write in this request, so nothing is lost on rollback.
+            self.rollback()
+            return super().execute(*args, **kwargs)
+
+    def _should_use_replica(self, clause):
+        if not _replica_configured():
+            return False
+        if not has_request_context() or request.method not in ('GET', 'HEAD'):
+            return False
+        # Flushes and bulk INSERT/UPDATE/DELETE statements are writes
+        if self._flushing or isinstance(clause, UpdateBase):
+            return False
+        if g.get('db_use_primary') or session.get('db_primary_until', 0) > time.time():
+            return False
+        return _replica_is_healthy(self._db.engines[REPLICA_BIND_KEY])
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(db_session, flush_context):
+    _pin_to_primary()
+
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
+
+if _replica_configured():
+    with app.app_context():
+        event.listen(db.engines[REPLICA_BIND_KEY], 'handle_error', _on_replica_error)
 
 from datetime import datetime
 
@@ -162,6 +280,7 @@ def login():
     return redirect(authorization_url)
 
 @app.route('/login/authorized')
+@use_primary_db
 def authorized():
     try:
         print("Received callback with URL:", request.url)
@@ -524,8 +643,8 @@ def auth_status():
 def init_db():
     with app.app_context():
         try:
-            # Create tables if they do not exist (idempotent)
-            db.create_all()
+            # Create tables if they do not exist (idempotent); the read replica is never migrated from here
+            db.create_all(bind_key=None)
             # On Postgres, widen password column if needed (from VARCHAR(100) to 255)
             try:
                 if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql://'):
@@ -3,9 +3,9 @@ from datetime import datetime
 from werkzeug.security import generate_password_hash
 
 with app.app_context():
-    # Drop all existing tables and recreate them
-    db.drop_all()
-    db.create_all()
+    # Drop all existing tables and recreate them (primary only; replicas follow via replication)
+    db.drop_all(bind_key=None)
+    db.create_all(bind_key=None)
 
     # Create initial admin user
     admin = Profile(
@@ -0,0 +1,31 @@
+import importlib
+import os
+import sys
+import tempfile
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def db_dir():
+    with tempfile.TemporaryDirectory() as path:
+        yield path
+
+
+@pytest.fixture(scope='session')
+def app_module(db_dir):
+    """Import app.py against a temporary SQLite primary and replica."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('DATABASE_URL', f"sqlite:///{os.path.join(db_dir, 'primary.db')}")
+        mp.setenv('DATABASE_REPLICA_URL', f"sqlite:///{os.path.join(db_dir, 'replica.db')}")
+        mp.syspath_prepend(REPO_ROOT)
+        # app.py writes client_secrets.json into the working directory on import
+        mp.chdir(db_dir)
+        module = importlib.import_module('app')
+        yield module
+        with module.app.app_context():
+            for engine in module.db.engines.values():
+                engine.dispose()
+        sys.modules.pop('app', None)
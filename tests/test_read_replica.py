@@ -0,0 +1,260 @@
+"""Read replica routing, run against two temporary SQLite files.
+
+The primary and the replica hold the same users with different names, so each
+response shows which database served it.
+"""
+import os
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import session
+from flask_jwt_extended import create_access_token
+from sqlalchemy import update
+
+ADMIN_EMAIL = 'admin@getcovered.io'
+USER_EMAIL = 'user@getcovered.io'
+# Only on the primary, as if replication has not caught up yet
+LAGGING_EMAIL = 'new.hire@example.com'
+
+
+@pytest.fixture
+def primary_path(db_dir):
+    return os.path.join(db_dir, 'primary.db')
+
+
+@pytest.fixture
+def replica_path(db_dir):
+    return os.path.join(db_dir, 'replica.db')
+
+
+@pytest.fixture
+def app(app_module):
+    return app_module.app
+
+
+@pytest.fixture
+def replica_engine(app_module):
+    with app_module.app.app_context():
+        return app_module.db.engines[app_module.REPLICA_BIND_KEY]
+
+
+def _seed(profile_table, engine, label, extra_emails=()):
+    profile_table.drop(engine, checkfirst=True)
+    profile_table.create(engine)
+    rows = [
+        {'full_name': f'{label} Admin', 'email': ADMIN_EMAIL},
+        {'full_name': f'{label} User', 'email': USER_EMAIL},
+    ] + [{'full_name': f'{label} Lagging', 'email': email} for email in extra_emails]
+    with engine.begin() as conn:
+        conn.execute(profile_table.insert(), rows)
+
+
+def _emails(path):
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute('SELECT email FROM profile')}
+
+
+@pytest.fixture(autouse=True)
+def databases(app_module, replica_engine, replica_path):
+    if os.path.isdir(replica_path):
+        os.rmdir(replica_path)
+    replica_engine.dispose()
+    profile_table = app_module.Profile.__table__
+    with app_module.app.app_context():
+        _seed(profile_table, app_module.db.engine, 'Primary', extra_emails=[LAGGING_EMAIL])
+    _seed(profile_table, replica_engine, 'Replica')
+    app_module._replica_health.update(healthy=True, checked_at=None)
+    yield
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    def make(email):
+        with app.app_context():
+            return {'Authorization': f'Bearer {create_access_token(identity=email)}'}
+    return make
+
+
+@pytest.fixture
+def take_replica_down(replica_engine, replica_path):
+    def take_down():
+        replica_engine.dispose()
+        os.remove(replica_path)
+        # SQLite cannot open a directory as a database, which looks like an unreachable server
+        os.mkdir(replica_path)
+    return take_down
+
+
+@pytest.fixture
+def clock(app_module, monkeypatch):
+    """Controls the wall and monotonic clocks that app.py sees."""
+    offset = SimpleNamespace(seconds=0)
+    monkeypatch.setattr(app_module, 'time', SimpleNamespace(
+        time=lambda: time.time() + offset.seconds,
+        monotonic=lambda: time.monotonic() + offset.seconds,
+    ))
+    return offset
+
+
+def test_get_reads_from_replica(client, auth_headers):
+    response = client.get('/api/dashboard', headers=auth_headers(USER_EMAIL))
+    assert response.status_code == 200
+    assert response.json['full_name'] == 'Replica User'
+
+    response = client.get('/api/admin/users', headers=auth_headers(ADMIN_EMAIL))
+    assert response.status_code == 200
+    assert {user['full_name'] for user in response.json['users']} == {'Replica Admin', 'Replica User'}
+
+
+def test_post_writes_to_primary(client, primary_path):
+    response = client.post('/api/signup', json={
+        'email': 'signup@getcovered.io',
+        'password': 'password123',
+        'full_name': 'Signup User',
+    })
+    assert response.status_code == 201
+    assert 'signup@getcovered.io' in _emails(primary_path)
+
+
+def test_put_writes_to_primary(client, auth_headers, primary_path):
+    response = client.put('/api/profile', json={'full_name': 'Renamed'}, headers=auth_headers(USER_EMAIL))
+    assert response.status_code == 200
+    with sqlite3.connect(primary_path) as conn:
+        name = conn.execute('SELECT full_name FROM profile WHERE email = ?', (USER_EMAIL,)).fetchone()[0]
+    assert name == 'Renamed'
+
+
+def test_delete_writes_to_primary(client, auth_headers, primary_path):
+    response = client.delete('/api/account', headers=auth_headers(USER_EMAIL))
+    assert response.status_code == 200
+    assert USER_EMAIL not in _emails(primary_path)
+
+
+def test_write_makes_same_client_read_from_primary(app, client, auth_headers):
+    headers = auth_headers(USER_EMAIL)
+    client.put('/api/profile', json={'full_name': 'Renamed'}, headers=headers)
+
+    assert client.get('/api/dashboard', headers=headers).json['full_name'] == 'Renamed'
+    # Another client has no sticky cookie and still reads the replica
+    assert app.test_client().get('/api/dashboard', headers=headers).json['full_name'] == 'Replica User'
+
+
+def test_primary_pin_expires_after_sticky_seconds(app_module, client, auth_headers, clock):
+    headers = auth_headers(USER_EMAIL)
+    client.put('/api/profile', json={'full_name': 'Renamed'}, headers=headers)
+
+    clock.seconds = app_module.REPLICA_STICKY_SECONDS - 1
+    assert client.get('/api/dashboard', headers=headers).json['full_name'] == 'Renamed'
+
+    clock.seconds = app_module.REPLICA_STICKY_SECONDS + 1
+    assert client.get('/api/dashboard', headers=headers).json['full_name'] == 'Replica User'
+
+
+def test_bulk_update_pins_reads_to_primary(app_module, app):
+    db, Profile = app_module.db, app_module.Profile
+    with app.test_request_context('/api/dashboard', method='GET'):
+        db.session.execute(update(Profile).where(Profile.email == USER_EMAIL).values(full_name='Bulk'))
+
+        assert Profile.query.filter_by(email=USER_EMAIL).first().full_name == 'Bulk'
+        assert 'db_primary_until' in session
+        db.session.rollback()
+
+
+def test_writes_set_no_cookie_without_replica(app, client, monkeypatch):
+    monkeypatch.delitem(app.config, 'SQLALCHEMY_BINDS')
+
+    response = client.post('/api/signup', json={
+        'email': 'signup@getcovered.io',
+        'password': 'password123',
+        'full_name': 'Signup User',
+    })
+
+    assert response.status_code == 201
+    assert 'Set-Cookie' not in response.headers
+    with client.session_transaction() as flask_session:
+        assert 'db_primary_until' not in flask_session
+
+
+def test_oauth_callback_reads_from_primary(app_module, client, monkeypatch):
+    flow = SimpleNamespace(
+        fetch_token=lambda **kwargs: None,
+        credentials=SimpleNamespace(id_token='id-token'),
+    )
+    monkeypatch.setattr(app_module.Flow, 'from_client_secrets_file', lambda *args, **kwargs: flow)
+    monkeypatch.setattr(app_module.id_token, 'verify_oauth2_token', lambda *args: {
+        'email': LAGGING_EMAIL,
+        'name': 'New Hire',
+    })
+    with client.session_transaction() as flask_session:
+        flask_session['oauth_state'] = 'state'
+
+    response = client.get('/login/authorized?state=state&code=code')
+
+    # Read from the replica, the existing user would be treated as a new signup outside the allowed domains
+    assert '/auth/callback?token=' in response.headers['Location']
+
+
+def test_reads_fall_back_to_primary_when_replica_is_down(client, auth_headers, take_replica_down):
+    take_replica_down()
+
+    response = client.get('/api/dashboard', headers=auth_headers(USER_EMAIL))
+    assert response.status_code == 200
+    assert response.json['full_name'] == 'Primary User'
+
+
+def test_replica_failure_after_healthy_probe_retries_on_primary(app_module, client, auth_headers, take_replica_down):
+    headers = auth_headers(ADMIN_EMAIL)
+    assert client.get('/api/admin/users', headers=headers).json['users'][0]['full_name'] == 'Replica Admin'
+
+    take_replica_down()
+
+    for _ in range(2):
+        response = client.get('/api/admin/users', headers=headers)
+        assert response.status_code == 200
+        assert response.json['users'][0]['full_name'] == 'Primary Admin'
+    assert app_module._replica_health['healthy'] is False
+
+
+def test_empty_replica_counts_as_down(app_module, client, auth_headers, replica_engine):
+    app_module.Profile.__table__.drop(replica_engine)
+
+    response = client.get('/api/dashboard', headers=auth_headers(USER_EMAIL))
+    assert response.status_code == 200
+    assert response.json['full_name'] == 'Primary User'
+
+
+def test_probe_reports_replica_without_schema_as_down(app_module, replica_engine):
+    assert app_module._replica_is_healthy(replica_engine) is True
+
+    app_module.Profile.__table__.drop(replica_engine)
+    app_module._replica_health['checked_at'] = None
+    assert app_module._replica_is_healthy(replica_engine) is False
+
+
+def test_failed_probe_is_logged_once(app_module, replica_engine, take_replica_down, capsys):
+    take_replica_down()
+
+    assert app_module._replica_is_healthy(replica_engine) is False
+    assert capsys.readouterr().out.count('Read replica unavailable') == 1
+
+
+def test_probe_finds_replica_healthy_again_after_ttl(app_module, replica_engine, replica_path,
+                                                     take_replica_down, clock):
+    take_replica_down()
+    assert app_module._replica_is_healthy(replica_engine) is False
+
+    os.rmdir(replica_path)
+    _seed(app_module.Profile.__table__, replica_engine, 'Replica')
+    # Still inside the TTL, the cached failure is trusted
+    assert app_module._replica_is_healthy(replica_engine) is False
+
+    clock.seconds = app_module.REPLICA_HEALTH_TTL_SECONDS + 1
+    assert app_module._replica_is_healthy(replica_engine) is True